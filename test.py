@@ -12,6 +12,10 @@ from datetime import datetime
 # Configuration
 BASE_URL = "http://localhost:5000"  # Change to your ngrok URL when deployed
 
+# One session for all calls so keep-alive pooling amortizes TCP setup
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -38,7 +42,7 @@ def print_header():
 def check_server():
     """Check if the API server is running"""
     try:
-        response = requests.get(BASE_URL, timeout=5)
+        response = SESSION.get(BASE_URL, timeout=5)
         if response.status_code == 200:
             print(f"{Colors.GREEN}✓ Server is running at {BASE_URL}{Colors.END}")
             return True
@@ -65,7 +69,7 @@ def get_user_input():
 def test_mood_analysis(text):
     """Test mood analysis endpoint with user input"""
     try:
-        response = requests.post(f"{BASE_URL}/analyze_mood",
+        response = SESSION.post(f"{BASE_URL}/analyze_mood",
                                  json={"text": text},
                                  timeout=10)
 
@@ -99,7 +103,7 @@ def test_mood_analysis(text):
 def test_crisis_detection(text):
     """Test crisis detection endpoint with user input"""
     try:
-        response = requests.post(f"{BASE_URL}/detect_crisis",
+        response = SESSION.post(f"{BASE_URL}/detect_crisis",
                                  json={"text": text},
                                  timeout=10)
 
@@ -125,7 +129,7 @@ def test_crisis_detection(text):
 def test_summarization(text):
     """Test text summarization endpoint with user input"""
     try:
-        response = requests.post(f"{BASE_URL}/summarize",
+        response = SESSION.post(f"{BASE_URL}/summarize",
                                  json={"text": text},
                                  timeout=10)
 